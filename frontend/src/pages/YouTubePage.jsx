@@ -76,6 +76,22 @@ export default function YouTubePage() {
         }
     };
 
+    const selectSummary = async (summary) => {
+        // History items carry only header fields; fetch the full document
+        // (summary, key points, timestamps) the first time one is opened
+        if (summary.summary) {
+            setCurrentSummary(summary);
+            return;
+        }
+        try {
+            const response = await axios.get(`${API}/youtube/summaries/${summary.id}`);
+            setSummaries(prev => prev.map(s => (s.id === summary.id ? response.data : s)));
+            setCurrentSummary(response.data);
+        } catch (error) {
+            toast.error('Failed to load summary');
+        }
+    };
+
     const deleteSummary = async (summaryId) => {
         try {
             await axios.delete(`${API}/youtube/summaries/${summaryId}`);
@@ -367,7 +383,7 @@ export default function YouTubePage() {
                                                     className={`p-3 rounded-lg border cursor-pointer transition-all hover:shadow-md ${
                                                         currentSummary?.id === summary.id ? 'border-primary bg-accent' : ''
                                                     }`}
-                                                    onClick={() => setCurrentSummary(summary)}
+                                                    onClick={() => selectSummary(summary)}
                                                     data-testid={`summary-${summary.id}`}
                                                 >
                                                     <div className="flex gap-3">
@@ -381,7 +397,9 @@ export default function YouTubePage() {
                                                                 {summary.video_title}
                                                             </h4>
                                                             <p className="text-xs text-muted-foreground mt-1">
-                                                                {summary.key_points?.length || 0} key points
+                                                                {summary.key_points
+                                                                    ? `${summary.key_points.length} key points`
+                                                                    : new Date(summary.created_at).toLocaleDateString()}
                                                             </p>
                                                         </div>
                                                         <Button